@@ -32,7 +32,7 @@
 Collect data from rtldavis  
 see: https://github.com/bemasher/rtldavis
 
-Run rtld on a thread and push the output onto a queue.
+Run rtld as a subprocess and read its output from the pipes with select.
 
 ....
 
@@ -73,43 +73,72 @@ from __future__ import print_function  # Python 2/3 compatiblity
 from __future__ import with_statement
 
 from subprocess import check_output
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from struct import Struct
 import signal
 from calendar import timegm
 import fnmatch
+import io
 import os
 import re
+import select
+import shlex
 import subprocess
 import math
 import string
-import threading
+import sys
 import time
 
-# Python 2/3 compatiblity
-try:
-    import Queue as queue   # python 2
-except ImportError:
-    import queue            # python 3
-
 import weewx.drivers
 import weewx.engine
 import weewx.units
 from weewx.crc16 import crc16
 from weewx.units import obs_group_dict
+from weewx.wxformulas import FtoC
 from weeutil.weeutil import tobool
 
+# Use the C implementation of crcmod for the CRC check of the data packets
+# when it is installed; it computes the same CRC-16 (XMODEM) as weewx.crc16
+try:
+    import crcmod.predefined
+    _crc16 = crcmod.predefined.mkPredefinedCrcFun('xmodem')
+except ImportError:
+    _crc16 = crc16
+
+# convert the hex digits of a packet to an immutable bytes object in one call;
+# python 2 has no bytes.fromhex and its str items are no integers, so use a
+# bytearray there
+_fromhex = getattr(bytes, 'fromhex', bytearray.fromhex)
+
+# a clock that is not affected by time adjustments; python 2 has none
+try:
+    from time import monotonic as _monotonic
+except ImportError:
+    _monotonic = time.time
+
+# the current time in integer nanoseconds, so that whole seconds can be taken
+# without a float; python 2 and python 3 before 3.7 have no time_ns
+try:
+    from time import time_ns
+except ImportError:
+    def time_ns():
+        return int(time.time() * 1000000000)
+
 # Use new-style weewx logging
 import weeutil.logger
 import logging
 log = logging.getLogger(__name__)
 
-def logdbg(msg):
-    log.debug(msg)
+def logdbg(msg, *args):
+    log.debug(msg, *args)
 
-def loginf(msg):
-    log.info(msg)
+def loginf(msg, *args):
+    log.info(msg, *args)
 
-def logerr(msg):
-    log.error(msg)
+def logerr(msg, *args):
+    log.error(msg, *args)
 
 DRIVER_NAME = 'Rtldavis'
 DRIVER_VERSION = '0.20'
@@ -148,18 +177,35 @@ def loader(config_dict, engine):
 def confeditor_loader():
     return RtldavisConfigurationEditor()
 
-def dbg_parse(verbosity, msg):
+# The hot paths test DEBUG_PARSE/DEBUG_RTLD themselves before calling these,
+# so that neither the call nor the arguments are made when debugging is off.
+# The levels are read at each call, as the driver sets them from its config
+# after this module is loaded.
+def dbg_parse(verbosity, msg, *args):
     if DEBUG_PARSE >= verbosity:
-        logdbg(msg)
+        logdbg(msg, *args)
 
-def dbg_rtld(verbosity, msg):
+def dbg_rtld(verbosity, msg, *args):
     if DEBUG_RTLD >= verbosity:
-        logdbg(msg)
+        logdbg(msg, *args)
 
 def _fmt(data):
     if not data:
         return ''
-    return ' '.join(['%02x' % ord(x) for x in data])
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytearray([ord(x) for x in data])
+    try:
+        return data.hex(' ')
+    except (AttributeError, TypeError):
+        # no bytes.hex(sep) before python 3.8
+        return ' '.join(['%02x' % x for x in bytearray(data)])
+
+# the header and sensor bytes 0-5 of a data packet
+_PKT_HDR = Struct('6B')
+
+def _extract_10bit(hi, lo):
+    # 10-bit sensor value: all 8 bits of hi followed by the top 2 bits of lo
+    return ((hi << 2) | (lo >> 6)) & 0x3FF
 
 # default temperature for soil moisture and leaf wetness sensors that
 # do not have a temperature sensor.
@@ -168,24 +214,37 @@ DEFAULT_SOIL_TEMP = 24 # C
 
 RAW = 0  # indices of table with raw values
 POT = 1  # indices of table with potentials
+SLOPE = 2  # indices of table with potential per raw value after each raw value
+
+def _potential_slopes(lookup):
+    # potential per raw value between each pair of neighbouring table values
+    return tuple((lookup[POT][x] - lookup[POT][x - 1]) / (lookup[RAW][x] - lookup[RAW][x - 1])
+                 for x in range(1, len(lookup[RAW])))
 
 # Lookup table for soil_moisture_raw values to get a soil_moisture value based
 # upon a linear formula.  Correction factor = 0.009
 SM_MAP = {RAW: ( 99.2, 140.1, 218.7, 226.9, 266.8, 391.7, 475.6, 538.2, 596.1, 673.7, 720.1),
           POT: (  0.0,   1.0,   9.0,  10.0,  15.0,  35.0,  55.0,  75.0, 100.0, 150.0, 200.0)}
+SM_MAP[SLOPE] = _potential_slopes(SM_MAP)
+_SM_RAW, _SM_POT, _SM_SLOPE = SM_MAP[RAW], SM_MAP[POT], SM_MAP[SLOPE]
 
 # Lookup table for leaf_wetness_raw values to get a leaf_wetness value based
 # upon a linear formula.  Correction factor = 0.0
 LW_MAP = {RAW: (857.0, 864.0, 895.0, 911.0, 940.0, 952.0, 991.0, 1013.0),
           POT: ( 15.0,  14.0,   5.0,   4.0,   3.0,   2.0,   1.0,    0.0)}
+LW_MAP[SLOPE] = _potential_slopes(LW_MAP)
+_LW_RAW, _LW_POT, _LW_SLOPE = LW_MAP[RAW], LW_MAP[POT], LW_MAP[SLOPE]
 
+# packet fields of the leaf and soil sensors 1-8, by sensor index 0-7
+_SOIL_TEMP_KEYS = tuple('soil_temp_%d' % i for i in range(1, 9))
+_SOIL_MOIST_KEYS = tuple('soil_moisture_%d' % i for i in range(1, 9))
+_LEAF_TEMP_KEYS = tuple('leaf_temp_%d' % i for i in range(1, 9))
+_LEAF_WET_KEYS = tuple('leaf_wetness_%d' % i for i in range(1, 9))
 
-def calculate_thermistor_temp(temp_raw):
-    """ Decode the raw thermistor temperature, then calculate the actual
-    thermistor temperature and the leaf_soil potential, using Davis' formulas.
-    see: https://github.com/cmatteri/CC1101-Weather-Receiver/wiki/Soil-Moisture-Station-Protocol
-    :param temp_raw: raw value from sensor for leaf wetness and soil moisture
-    """
+
+def _thermistor_temp(temp_raw):
+    # Davis' formulas; returns the resistance and the temperature, or None
+    # for the temperature when the resistance is out of range
 
     # Convert temp_raw to a resistance (R) in kiloOhms
     a = 18.81099
@@ -195,24 +254,56 @@ def calculate_thermistor_temp(temp_raw):
     # Steinhart-Hart parameters
     s1 = 0.002783573
     s2 = 0.0002509406
-    try:
-        thermistor_temp = 1 / (s1 + s2 * math.log(r)) - 273
-        dbg_parse(3, 'r (k ohm) %s temp_raw %s thermistor_temp %s' %
-                  (r, temp_raw, thermistor_temp))
+    # test the log domain up front instead of catching its ValueError
+    if r > 0:
+        return r, 1 / (s1 + s2 * math.log(r)) - 273
+    return r, None
+
+# thermistor temperatures of all 10-bit temp_raw values of the leaf and soil
+# sensors; None where calculate_thermistor_temp fails (temp_raw 0 and values
+# out of range), so that those still take its error path
+_THERMISTOR_LUT = tuple([None] + [_thermistor_temp(temp_raw)[1]
+                                  for temp_raw in range(1, 0x400)])
+
+# resistances and thermistor temperatures calculated so far, by temp_raw.
+# There are at most 4096 different temp_raw values, so this cache stays small.
+_THERMISTOR_TEMPS = dict()
+
+def calculate_thermistor_temp(temp_raw):
+    """ Decode the raw thermistor temperature, then calculate the actual
+    thermistor temperature and the leaf_soil potential, using Davis' formulas.
+    The result is cached per temp_raw value.
+    see: https://github.com/cmatteri/CC1101-Weather-Receiver/wiki/Soil-Moisture-Station-Protocol
+    :param temp_raw: raw value from sensor for leaf wetness and soil moisture
+    """
+
+    cached = _THERMISTOR_TEMPS.get(temp_raw)
+    if cached is not None:
+        r, thermistor_temp = cached
+    else:
+        r, thermistor_temp = _thermistor_temp(temp_raw)
+        if thermistor_temp is not None:
+            _THERMISTOR_TEMPS[temp_raw] = (r, thermistor_temp)
+    if thermistor_temp is not None:
+        if DEBUG_PARSE >= 3:
+            dbg_parse(3, 'r (k ohm) %s temp_raw %s thermistor_temp %s',
+                      r, temp_raw, thermistor_temp)
         return thermistor_temp
-    except ValueError as e:
-        logerr('thermistor_temp failed for temp_raw %s r (k ohm) %s'
-               'error: %s' % (temp_raw, r, e))
+    logerr('thermistor_temp failed for temp_raw %s r (k ohm) %s: '
+           'resistance out of range', temp_raw, r)
     return DEFAULT_SOIL_TEMP
 
 
-def lookup_potential(sensor_name, norm_fact, sensor_raw, sensor_temp, lookup):
+def lookup_potential(sensor_name, norm_fact, sensor_raw, sensor_temp,
+                     lookup_raw, lookup_pot, lookup_slope):
     """Look up potential based upon a normalized raw value (i.e. temp corrected
     for DEFAULT_SOIL_TEMP) and a linear function between two points in the
     lookup table.
-    :param lookup: a table with both sensor_raw_norm values and corresponding
-                   potential values. the table is composed for a specific
-                   norm-factor.
+    :param lookup_slope: potential per raw value between neighbouring
+                         lookup_raw values
+    :param lookup_pot: potential values corresponding to lookup_raw
+    :param lookup_raw: ascending sensor_raw_norm values of the lookup table.
+                       the table is composed for a specific norm-factor.
     :param sensor_temp: sensor temp in C
     :param sensor_raw: sensor raw potential value
     :param norm_fact: temp correction factor for normalizing sensor-raw values
@@ -222,36 +313,120 @@ def lookup_potential(sensor_name, norm_fact, sensor_raw, sensor_temp, lookup):
     # normalize raw value for standard temperature (DEFAULT_SOIL_TEMP)
     sensor_raw_norm = sensor_raw * (1 + norm_fact * (sensor_temp - DEFAULT_SOIL_TEMP))
 
-    numcols = len(lookup[RAW])
-    if sensor_raw_norm >= lookup[RAW][numcols - 1]:
-        potential = lookup[POT][numcols - 1] # preset potential to last value
-        dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s >= RAW=%s" %
-                  (sensor_name, sensor_temp, norm_fact, sensor_raw,
-                   sensor_raw_norm, potential, lookup[RAW][numcols - 1]))
+    # index of the first table value above sensor_raw_norm; values outside
+    # the table get the potential of the first or last table value
+    x = bisect_right(lookup_raw, sensor_raw_norm)
+    if 0 < x < len(lookup_raw):
+        # the common case: determine the potential value
+        potential_offset = (sensor_raw_norm - lookup_raw[x - 1]) * lookup_slope[x - 1]
+        potential = lookup_pot[x - 1] + potential_offset
+        if DEBUG_PARSE >= 2:
+            dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s RAW=%s to %s POT=%s to %s ",
+                      sensor_name, sensor_temp, norm_fact, sensor_raw,
+                      sensor_raw_norm, potential,
+                      lookup_raw[x - 1], lookup_raw[x],
+                      lookup_pot[x - 1], lookup_pot[x])
+    elif x:
+        potential = lookup_pot[x - 1]
+        if DEBUG_PARSE >= 2:
+            dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s >= RAW=%s",
+                      sensor_name, sensor_temp, norm_fact, sensor_raw,
+                      sensor_raw_norm, potential, lookup_raw[x - 1])
     else:
-        potential = lookup[POT][0] # preset potential to first value
-        # lookup sensor_raw_norm value in table
-        for x in range(0, numcols):
-            if sensor_raw_norm < lookup[RAW][x]:
-                if x == 0:
-                    # 'pre zero' phase; potential = first value
-                    dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s < RAW=%s" %
-                              (sensor_name, sensor_temp, norm_fact, sensor_raw,
-                               sensor_raw_norm, potential, lookup[RAW][0]))
-                    break
-                else:
-                    # determine the potential value
-                    potential_per_raw = (lookup[POT][x] - lookup[POT][x - 1]) / (lookup[RAW][x] - lookup[RAW][x - 1])
-                    potential_offset = (sensor_raw_norm - lookup[RAW][x - 1]) * potential_per_raw
-                    potential = lookup[POT][x - 1] + potential_offset
-                    dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s RAW=%s to %s POT=%s to %s " %
-                              (sensor_name, sensor_temp, norm_fact, sensor_raw,
-                               sensor_raw_norm, potential,
-                               lookup[RAW][x - 1], lookup[RAW][x],
-                               lookup[POT][x - 1], lookup[POT][x]))
-                    break
+        # 'pre zero' phase; potential = first value
+        potential = lookup_pot[0]
+        if DEBUG_PARSE >= 2:
+            dbg_parse(2, "%s: temp=%s fact=%s raw=%s norm=%s potential=%s < RAW=%s",
+                      sensor_name, sensor_temp, norm_fact, sensor_raw,
+                      sensor_raw_norm, potential, lookup_raw[0])
     return potential
 
+# leaf wetness potentials of all 10-bit potential_raw values. The leaf wetness
+# table is not normalized (norm_fact 0.0), so the potential does not depend
+# on the leaf temperature and can be looked up directly.
+_LEAF_WETNESS_LUT = tuple(lookup_potential("leaf_wetness", 0.0,
+                                           potential_raw, DEFAULT_SOIL_TEMP,
+                                           _LW_RAW, _LW_POT, _LW_SLOPE)
+                          for potential_raw in range(0x400))
+
+# Error correction values for
+#  [ 1..29 by 1, 30..150 by 5 raw mph ]
+#   x
+#  [ 1, 4, 8..124 by 4, 127, 128 raw degrees ]
+#
+# Extracted from a Davis Weather Envoy using a DIY transmitter to
+# transmit raw values and logging LOOP packets.
+# first row: raw angles;
+# first column: raw speed;
+# cells: values provided in response to raw data by the Envoy;
+# [0][0] is filler
+WINDTAB = [
+    [0, 1, 4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 68, 72, 76, 80, 84, 88, 92, 96, 100, 104, 108, 112, 116, 120, 124, 127, 128],
+    [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0],
+    [4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0],
+    [5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 0, 0],
+    [6, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 0, 0],
+    [7, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
+    [8, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
+    [9, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
+    [10, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
+    [11, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
+    [12, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
+    [13, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [14, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [15, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [16, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [17, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [18, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
+    [19, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 1, 0, 0],
+    [20, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
+    [21, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
+    [22, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
+    [23, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
+    [24, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 2, 3, 4, 4, 2, 0, 0],
+    [25, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 4, 4, 2, 0, 0],
+    [26, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 4, 2, 0, 0],
+    [27, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
+    [28, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
+    [29, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
+    [30, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
+    [35, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 6, 5, 2, 0, -1],
+    [40, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 6, 6, 2, 0, -1],
+    [45, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 7, 6, 2, -1, -1],
+    [50, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 7, 7, 2, -1, -2],
+    [55, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 8, 7, 2, -1, -2],
+    [60, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 8, 8, 2, -1, -2],
+    [65, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 9, 8, 2, -2, -3],
+    [70, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 5, 9, 9, 2, -2, -3],
+    [75, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 6, 10, 9, 2, -2, -3],
+    [80, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 6, 10, 10, 2, -2, -3],
+    [85, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 0, 2, 7, 11, 11, 2, -3, -4],
+    [90, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 7, 12, 11, 2, -3, -4],
+    [95, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 3, 2, 2, 2, 1, 1, 1, 1, 2, 7, 12, 12, 3, -3, -4],
+    [100, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 2, 2, 2, 1, 1, 1, 1, 2, 8, 13, 12, 3, -3, -4],
+    [105, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 8, 13, 13, 3, -3, -4],
+    [110, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 8, 14, 14, 3, -3, -5],
+    [115, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 9, 15, 14, 3, -3, -5],
+    [120, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 3, 9, 15, 15, 3, -4, -5],
+    [125, 1, 1, 2, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 3, 2, 2, 1, 1, 1, 3, 10, 16, 16, 3, -4, -5],
+    [130, 1, 1, 2, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 3, 10, 17, 16, 3, -4, -6],
+    [135, 1, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 4, 3, 3, 2, 2, 2, 1, 1, 3, 10, 17, 17, 4, -4, -6],
+    [140, 1, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 3, 4, 4, 3, 3, 2, 2, 2, 1, 1, 3, 11, 18, 17, 4, -4, -6],
+    [145, 2, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 4, 3, 3, 3, 2, 2, 1, 1, 3, 11, 19, 18, 4, -4, -6],
+    [150, 2, 2, 2, 1, 1, 0, 0, -1, -1, 0, 0, 1, 1, 2, 3, 3, 4, 4, 4, 4, 4, 3, 3, 2, 2, 1, 1, 3, 12, 19, 19, 4, -4, -6]
+]
+
+# The same table split into its sorted axes and correction cells, so that the
+# bracketing speed and angle can be found with a binary search. The cells are
+# stored row by row as one array of signed bytes: the correction for speed
+# index s and angle index a is _WIND_CORR[s * _WIND_NUM_ANGLES + a].
+_WIND_ANGLES = array('B', WINDTAB[0][1:])
+_WIND_SPEEDS = array('B', [row[0] for row in WINDTAB[1:]])
+_WIND_NUM_ANGLES = len(_WIND_ANGLES)
+_WIND_CORR = array('b', [cell for row in WINDTAB[1:] for cell in row[1:]])
+
 # Normalize and interpolate raw wind values at raw angles
 def calc_wind_speed_ec(raw_mph, raw_angle):
 
@@ -260,109 +435,44 @@ def calc_wind_speed_ec(raw_mph, raw_angle):
     if raw_mph < 3 or raw_mph > 150:
         return raw_mph
 
-    # Error correction values for
-    #  [ 1..29 by 1, 30..150 by 5 raw mph ]
-    #   x
-    #  [ 1, 4, 8..124 by 4, 127, 128 raw degrees ]
-    #
-    # Extracted from a Davis Weather Envoy using a DIY transmitter to
-    # transmit raw values and logging LOOP packets.
-    # first row: raw angles;
-    # first column: raw speed;
-    # cells: values provided in response to raw data by the Envoy;
-    # [0][0] is filler
-    windtab = [
-        [0, 1, 4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 68, 72, 76, 80, 84, 88, 92, 96, 100, 104, 108, 112, 116, 120, 124, 127, 128],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0],
-        [4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0],
-        [5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 0, 0],
-        [6, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 0, 0],
-        [7, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
-        [8, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
-        [9, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 0, 0],
-        [10, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
-        [11, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
-        [12, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 0, 0],
-        [13, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [14, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [15, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [16, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [17, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [18, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 3, 3, 1, 0, 0],
-        [19, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 1, 0, 0],
-        [20, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
-        [21, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
-        [22, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
-        [23, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 3, 4, 4, 2, 0, 0],
-        [24, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 2, 3, 4, 4, 2, 0, 0],
-        [25, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 4, 4, 2, 0, 0],
-        [26, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 4, 2, 0, 0],
-        [27, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
-        [28, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
-        [29, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
-        [30, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 3, 5, 5, 2, 0, 0],
-        [35, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 6, 5, 2, 0, -1],
-        [40, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 6, 6, 2, 0, -1],
-        [45, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 4, 7, 6, 2, -1, -1],
-        [50, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 7, 7, 2, -1, -2],
-        [55, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 8, 7, 2, -1, -2],
-        [60, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 8, 8, 2, -1, -2],
-        [65, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 2, 5, 9, 8, 2, -2, -3],
-        [70, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 5, 9, 9, 2, -2, -3],
-        [75, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 6, 10, 9, 2, -2, -3],
-        [80, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 0, 2, 6, 10, 10, 2, -2, -3],
-        [85, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 0, 2, 7, 11, 11, 2, -3, -4],
-        [90, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 7, 12, 11, 2, -3, -4],
-        [95, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 3, 2, 2, 2, 1, 1, 1, 1, 2, 7, 12, 12, 3, -3, -4],
-        [100, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 2, 2, 2, 1, 1, 1, 1, 2, 8, 13, 12, 3, -3, -4],
-        [105, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 8, 13, 13, 3, -3, -4],
-        [110, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 8, 14, 14, 3, -3, -5],
-        [115, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 2, 9, 15, 14, 3, -3, -5],
-        [120, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 3, 9, 15, 15, 3, -4, -5],
-        [125, 1, 1, 2, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 3, 2, 2, 1, 1, 1, 3, 10, 16, 16, 3, -4, -5],
-        [130, 1, 1, 2, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 3, 10, 17, 16, 3, -4, -6],
-        [135, 1, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 4, 3, 3, 2, 2, 2, 1, 1, 3, 10, 17, 17, 4, -4, -6],
-        [140, 1, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 3, 4, 4, 3, 3, 2, 2, 2, 1, 1, 3, 11, 18, 17, 4, -4, -6],
-        [145, 2, 2, 2, 1, 1, 0, 0, 0, -1, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 4, 3, 3, 3, 2, 2, 1, 1, 3, 11, 19, 18, 4, -4, -6],
-        [150, 2, 2, 2, 1, 1, 0, 0, -1, -1, 0, 0, 1, 1, 2, 3, 3, 4, 4, 4, 4, 4, 3, 3, 2, 2, 1, 1, 3, 12, 19, 19, 4, -4, -6]
-    ]
-
-    # EC is symmetric between W/E (90/270°) - probably a wrong assumption,
-    # table needs to be redone for 0-360°
+    # EC is symmetric between W/E (90/270) - probably a wrong assumption,
+    # table needs to be redone for 0-360
     if raw_angle > 128:
         raw_angle = 256 - raw_angle
 
-    s0 = a0 = 1
-
-    while windtab[s0][0] < raw_mph:
-        s0 += 1
-    while windtab[0][a0] < raw_angle:
-        a0 += 1
+    s0 = bisect_left(_WIND_SPEEDS, raw_mph)
+    a0 = bisect_left(_WIND_ANGLES, raw_angle)
 
-    if windtab[s0][0] == raw_mph:
+    if _WIND_SPEEDS[s0] == raw_mph:
         s1 = s0
     else:
-        if s0 > 1:
+        if s0 > 0:
             s0 -= 1
-        s1 = len(windtab) - 1 if s0 == len(windtab) - 1 else s0 + 1
+        s1 = len(_WIND_SPEEDS) - 1 if s0 == len(_WIND_SPEEDS) - 1 else s0 + 1
 
-    if windtab[0][a0] == raw_angle:
+    if _WIND_ANGLES[a0] == raw_angle:
         a1 = a0
     else:
-        if a0 > 1:
+        if a0 > 0:
             a0 -= 1
-        a1 = len(windtab[0]) - 2 if a0 == len(windtab) - 1 else a0 + 1
+        a1 = len(_WIND_ANGLES) - 1 if a0 == len(_WIND_ANGLES) - 1 else a0 + 1
 
+    row0 = s0 * _WIND_NUM_ANGLES
+    row1 = s1 * _WIND_NUM_ANGLES
     if s0 == s1 and a0 == a1:
-        return raw_mph + windtab[s0][a0]
-    else:
-        return interpolate(windtab[0][a0], windtab[0][a1],
-                                      windtab[s0][0], windtab[s1][0],
-                                      windtab[s0][a0], windtab[s0][a1],
-                                      windtab[s1][a0], windtab[s1][a1],
-                                      raw_angle, raw_mph)
+        return raw_mph + _WIND_CORR[row0 + a0]
+    x0 = _WIND_CORR[row0 + a0]
+    x1 = _WIND_CORR[row0 + a1]
+    y0 = _WIND_CORR[row1 + a0]
+    y1 = _WIND_CORR[row1 + a1]
+    # most of the table needs no correction; then there is nothing to
+    # interpolate
+    if not (x0 or x1 or y0 or y1):
+        return raw_mph
+    return interpolate(_WIND_ANGLES[a0], _WIND_ANGLES[a1],
+                       _WIND_SPEEDS[s0], _WIND_SPEEDS[s1],
+                       x0, x1, y0, y1,
+                       raw_angle, raw_mph)
 
 # Simple bilinear interpolation
 #
@@ -382,8 +492,9 @@ def interpolate(rx0, rx1,
                 y0, y1,
                 x, y):
 
-    dbg_parse(2, "rx0=%s, rx1=%s, ry0=%s, ry1=%s, x0=%s, x1=%s, y0=%s, y1=%s, x=%s, y=%s" %
-              (rx0, rx1, ry0, ry1, x0, x1, y0, y1, x, y))
+    if DEBUG_PARSE >= 2:
+        dbg_parse(2, "rx0=%s, rx1=%s, ry0=%s, ry1=%s, x0=%s, x1=%s, y0=%s, y1=%s, x=%s, y=%s",
+                  rx0, rx1, ry0, ry1, x0, x1, y0, y1, x, y)
 
     if rx0 == rx1:
         return y + x0 + (y - ry0) / float(ry1 - ry0) * (y1 - y0)
@@ -391,42 +502,27 @@ def interpolate(rx0, rx1,
     if ry0 == ry1:
         return y + y0 + (x - rx0) / float(rx1 - rx0) * (x1 - x0)
 
-    dy0 = x0 + (y - ry0) / float(ry1 - ry0) * (y0 - x0)
-    dy1 = x1 + (y - ry0) / float(ry1 - ry0) * (y1 - x1)
-
-    return y + dy0 + (x - rx0) / float(rx1 - rx0) * (dy1 - dy0)
+    # relative position of the raw speed and angle between the fixed values
+    ty = (y - ry0) / float(ry1 - ry0)
+    tx = (x - rx0) / float(rx1 - rx0)
 
-class AsyncReader(threading.Thread):
-
-    def __init__(self, fd, queue, label):
-        threading.Thread.__init__(self)
-        self._fd = fd
-        self._queue = queue
-        self._running = False
-        self.setDaemon(True)
-        self.setName(label)
-
-    def run(self):
-        logdbg("start async reader for %s" % self.getName())
-        self._running = True
-        for line in iter(self._fd.readline, ''):
-            self._queue.put(line)
-            if not self._running:
-                break
-
-    def stop_running(self):
-        self._running = False
+    dy0 = x0 + ty * (y0 - x0)
+    dy1 = x1 + ty * (y1 - x1)
 
+    return y + dy0 + tx * (dy1 - dy0)
 
 class ProcManager():
 
     def __init__(self):
         self._cmd = None
         self._process = None
-        self.stderr_queue = queue.Queue()
-        self.stderr_reader = None
-        self.stdout_queue = queue.Queue()
-        self.stdout_reader = None
+        self._stderr_fd = None
+        self._stdout_fd = None
+        # pipes of rtldavis not yet at end of file, with the complete lines
+        # read from them and their trailing incomplete line, by descriptor
+        self._open_fds = []
+        self._lines = dict()
+        self._partial = dict()
 
     def get_pid(self, name):
         return map(int,check_output(["pidof",name]).split())
@@ -437,66 +533,84 @@ class ProcManager():
             pid_list = self.get_pid("rtldavis")
             for pid in pid_list:
                 os.kill(int(pid), signal.SIGKILL)
-                loginf("rtldavis with pid %s killed" % pid)
+                loginf("rtldavis with pid %s killed", pid)
         except:
             pass
 
         self._cmd = cmd
-        loginf("startup process '%s'" % self._cmd)
+        loginf("startup process '%s'", self._cmd)
         env = os.environ.copy()
         if path:
             env['PATH'] = path + ':' + env['PATH']
         if ld_library_path:
             env['LD_LIBRARY_PATH'] = ld_library_path
         try:
-            self._process = subprocess.Popen(cmd.split(' '),
+            self._process = subprocess.Popen(shlex.split(cmd),
                                              env=env,
                                              stderr=subprocess.PIPE,
                                              stdout=subprocess.PIPE)
-            self.stderr_reader = AsyncReader(
-                self._process.stderr, self.stderr_queue, 'stderr-thread')
-            self.stderr_reader.start()
-            self.stdout_reader = AsyncReader(
-                self._process.stdout, self.stdout_queue, 'stdout-thread')
-            self.stdout_reader.start()
         except (OSError, ValueError) as e:
             raise weewx.WeeWxIOError("failed to start process: %s" % e)
+        self._stderr_fd = self._process.stderr.fileno()
+        self._stdout_fd = self._process.stdout.fileno()
+        self._open_fds = [self._stderr_fd, self._stdout_fd]
+        for fd in self._open_fds:
+            self._lines[fd] = deque()
+            self._partial[fd] = b''
 
     def shutdown(self):
-        loginf('shutdown process %s' % self._cmd)
-        self.stderr_reader.stop_running()
-        self.stdout_reader.stop_running()
+        loginf('shutdown process %s', self._cmd)
         # kill existiing rtldavis processes
         pid_list = self.get_pid("rtldavis")
         for pid in pid_list:
             os.kill(int(pid), signal.SIGKILL)
-            loginf("rtldavis with pid %s killed" % pid)
+            loginf("rtldavis with pid %s killed", pid)
 
     def running(self):
         return self._process.poll() is None
 
+    def _read_pipes(self, timeout):
+        # Wait at most timeout seconds until rtldavis has written to its
+        # pipes, then read what is available from each ready pipe in one
+        # os.read and split it into lines.
+        ready = select.select(self._open_fds, [], [], timeout)[0]
+        for fd in ready:
+            data = os.read(fd, io.DEFAULT_BUFFER_SIZE)
+            if data:
+                lines = (self._partial[fd] + data).split(b'\n')
+                self._partial[fd] = lines.pop()
+            else:
+                # end of file; pass on an incomplete last line as well
+                self._open_fds.remove(fd)
+                lines = [self._partial[fd]] if self._partial[fd] else []
+                self._partial[fd] = b''
+            self._lines[fd].extend(
+                [line.decode('utf-8', 'replace') + '\n' for line in lines])
+
     def get_stdout(self):
-        lines = []
-        while not self.stdout_queue.empty():
-            lines.append(self.stdout_queue.get().decode('utf-8'))
+        self._read_pipes(0)
+        lines = self._lines[self._stdout_fd]
+        self._lines[self._stdout_fd] = deque()
         return lines
 
     def get_stderr(self):
-        lines = [] 
         # When a lot rtldavis packets are read, a hangup
         # will occur regularly, sometimes of more than a minute.
         # Therefor a maximum run-time of get_stderr of 10 seconds 
         # is invoked to let genLoopPackets process the yielded lines. 
-        start_time = int(time.time())
-        while self.running() and int(time.time()) - start_time < 10:
-            try:             
-                line = self.stderr_queue.get(True, 10).decode('utf-8')
-                lines.append(line) 
-                yield lines
-                lines = []
-            except queue.Empty:
+        deadline = _monotonic() + 10.0
+        while self.running():
+            remaining = deadline - _monotonic()
+            if remaining <= 0:
+                break
+            # yield all lines read so far in one batch; only wait for
+            # rtldavis when nothing was read yet
+            if not self._lines[self._stderr_fd]:
+                self._read_pipes(remaining)
+            lines = self._lines[self._stderr_fd]
+            if lines:
+                self._lines[self._stderr_fd] = deque()
                 yield lines
-                lines = []
 
 
 class Packet:
@@ -505,95 +619,89 @@ class Packet:
         pass
 
     @staticmethod
-    def parse_text(ts, payload, lines):
+    def parse_text(ts, payload, lines, now):
         return None
 
 
 class DATAPacket(Packet):
     IDENTIFIER = re.compile("^\d\d:\d\d:\d\d.[\d]{6} [0-9A-F][0-7][0-9A-F]{14}")
-    PATTERN = re.compile('([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2})([0-9A-F]{2}) ([\d]+) ([\d]+) ([\d]+) ([\d]+)')
+    # anchored at the time stamp that IDENTIFIER already found at the start;
+    # the time stamp is 16 characters long, so the 8 packet bytes are always
+    # at payload[16:32] followed by the 4 counters
+    PATTERN = re.compile(r'\d\d:\d\d:\d\d.[\d]{6} [0-9A-F]{16} [\d]+ [\d]+ [\d]+ [\d]+')
 
     @staticmethod
-    def parse_text(self, payload, lines):
+    def parse_text(self, payload, lines, now):
         pkt = dict()
-        m = DATAPacket.PATTERN.search(lines[0])
+        m = DATAPacket.PATTERN.match(payload)
         if m:
-            dbg_rtld(2, "data: %s" % lines[0])
-            raw_msg = [0] * 8
-            for i in range(0, 8):
-                raw_msg[i] = chr(int(m.group(i + 1), 16))
-            PacketFactory._check_crc(raw_msg)
-            for i in range(0, 8):
-                raw_msg[i] = m.group(i + 1)
-            raw_pkt = bytearray([int(i, base=16) for i in raw_msg])
+            if DEBUG_RTLD >= 2:
+                dbg_rtld(2, "data: %s", lines[0])
+            raw_pkt = _fromhex(payload[16:32])
+            PacketFactory._check_crc(raw_pkt)
             pkt = self.parse_raw(self, raw_pkt)
-            for i in range(0, 4):
-                pkt['curr_cnt%d' % i] = int(m.group(i + 9))
-            dbg_rtld(3, "data_pkt: %s" % pkt)
-            lines.pop(0)
+            cnt = payload[33:m.end()].split()
+            pkt['curr_cnt0'] = int(cnt[0])
+            pkt['curr_cnt1'] = int(cnt[1])
+            pkt['curr_cnt2'] = int(cnt[2])
+            pkt['curr_cnt3'] = int(cnt[3])
+            if DEBUG_RTLD >= 3:
+                dbg_rtld(3, "data_pkt: %s", pkt)
+            lines.popleft()
             return pkt
         else:
-            dbg_rtld(1, "DATAPacket: unrecognized data: '%s'" % lines[0])
-            lines.pop(0)
+            if DEBUG_RTLD >= 1:
+                dbg_rtld(1, "DATAPacket: unrecognized data: '%s'", lines[0])
+            lines.popleft()
+
+
+# packet fields of the frequency errors by channel index
+_FREQ_ERR_KEYS = tuple('freqError%d' % i for i in range(0, 5))
 
 
 class CHANNELPacket(Packet):
     IDENTIFIER = re.compile("ChannelIdx:")
     # chan: 13:44:13.116046 Hop: {ChannelIdx:3 ChannelFreq:868437250 FreqError:431 Transmitter:1}
-    PATTERNv13 = re.compile('ChannelIdx:([\d]+) ChannelFreq:([\d]+) FreqError:([\d-]+) Transmitter:([\d]+)')
-    PATTERNv12 = re.compile('ChannelIdx:([\d]+) ChannelFreq:([\d]+) FreqError:([\d-]+)')
+    # rtldavis version 12 and lower do not report the Transmitter
+    PATTERN = re.compile(r'ChannelIdx:([\d]+) ChannelFreq:([\d]+) FreqError:([\d-]+)(?: Transmitter:([\d]+))?')
 
     @staticmethod
-    def parse_text(self, payload, lines):
+    def parse_text(self, payload, lines, now):
         pkt = dict()
-        # check for channelpacket of rtldavis version 13 and higher
-        m = CHANNELPacket.PATTERNv13.search(lines[0])
+        m = CHANNELPacket.PATTERN.search(lines[0])
         if m:
-            dbg_rtld(2, "chan: %s" % lines[0])
+            if DEBUG_RTLD >= 2:
+                dbg_rtld(2, "chan: %s", lines[0])
 
-            if abs(int(m.group(3))) > 20000:
+            freq_error = int(m.group(3))
+            if abs(freq_error) > 20000:
                 raise weewx.WeeWxIOError("RESTART RTLDAVIS PROGRAM: abs freqOffset channel %s too big (> 20000): %s" % (m.group(1), m.group(3)))
             # save frequency errors only for EU band
             if self.frequency == 'EU':
                 # Store the FreqErrors only for one transmitter
                 # The data for each transmitter is stored during 2 full days
-                if int(m.group(4)) == self.transm_to_store:
-                    pkt['dateTime'] = int(time.time() + 0.5)
+                if m.group(4) is None or int(m.group(4)) == self.transm_to_store:
+                    pkt['dateTime'] = now
                     pkt['usUnits'] = weewx.METRICWX
-                    for y in range(0, 5):
-                        if int(m.group(1)) == y:
-                            pkt['freqError%d' % y] = int(m.group(3))
-                            dbg_rtld(3, "Store freqError%d: %s for transmitter: %s" % (y, int(m.group(3)), int(m.group(4))))
-                    dbg_rtld(3, "chan_pkt: %s" % pkt)
+                    y = int(m.group(1))
+                    if 0 <= y < 5:
+                        pkt[_FREQ_ERR_KEYS[y]] = freq_error
+                        if DEBUG_RTLD >= 3 and m.group(4) is not None:
+                            dbg_rtld(3, "Store freqError%d: %s for transmitter: %s", y, freq_error, int(m.group(4)))
+                    if DEBUG_RTLD >= 3:
+                        dbg_rtld(3, "chan_pkt: %s", pkt)
                 else:
-                    dbg_rtld(3, "Don't store freqErr: %s for transm: %s" % (int(m.group(3)), int(m.group(4))))
+                    if DEBUG_RTLD >= 3:
+                        dbg_rtld(3, "Don't store freqErr: %s for transm: %s", freq_error, int(m.group(4)))
             else:
-                dbg_rtld(3, "Don't store freqErrors for frequency band %s" % self.frequency)
-            lines.pop(0)
+                if DEBUG_RTLD >= 3:
+                    dbg_rtld(3, "Don't store freqErrors for frequency band %s", self.frequency)
+            lines.popleft()
             return pkt
         else:
-            # check for channelpacket of rtldavis version 12 and lower
-            m = CHANNELPacket.PATTERNv12.search(lines[0])
-            if m:
-                dbg_rtld(2, "chan: %s" % lines[0])
-
-                if abs(int(m.group(3))) > 20000:
-                    raise weewx.WeeWxIOError("RESTART RTLDAVIS PROGRAM: abs freqOffset channel %s too big (> 20000): %s" % (m.group(1), m.group(3)))
-                # save frequency errors only for EU band
-                if self.frequency == 'EU':
-                    pkt['dateTime'] = int(time.time() + 0.5)
-                    pkt['usUnits'] = weewx.METRICWX
-                    for y in range(0, 5):
-                        if int(m.group(1)) == y:
-                            pkt['freqError%d' % y] = int(m.group(3))
-                    dbg_rtld(3, "chan_pkt: %s" % pkt)
-                else:
-                    dbg_rtld(3, "Don't store freqErrors for frequency band %s" % self.frequency)
-                lines.pop(0)
-                return pkt
-            else:
-                dbg_rtld(1, "CHANNELPacket: unrecognized data: '%s'" % lines[0])
-                lines.pop(0)
+            if DEBUG_RTLD >= 1:
+                dbg_rtld(1, "CHANNELPacket: unrecognized data: '%s'", lines[0])
+            lines.popleft()
 
 
 class PacketFactory(object):
@@ -604,33 +712,43 @@ class PacketFactory(object):
         CHANNELPacket
     ]
 
+    # the IDENTIFIERs of all known packets combined in one regex with a named
+    # group per packet class, so that one search selects the parser of a line
+    _DISPATCH_RE = re.compile('|'.join(
+        '(?P<%s>%s)' % (p.__name__, p.IDENTIFIER.pattern) for p in KNOWN_PACKETS))
+    _DISPATCH = dict((p.__name__, p) for p in KNOWN_PACKETS)
+
     @staticmethod
     def _check_crc(msg):
-        if crc16(msg) != 0:
+        if _crc16(bytes(msg)) != 0:
             raise ValueError("CRC error")
 
     @staticmethod
     def create(self, lines):
-        # return a list of packets from the specified lines
+        # return a list of packets from the specified lines; the lines of
+        # one batch are read at the same moment, so they share one time stamp
+        now = (time_ns() + 500000000) // 1000000000
         while lines:
-            pkt = PacketFactory.parse_text(self, lines)
+            pkt = PacketFactory.parse_text(self, lines, now)
             if pkt is not None:
                 yield pkt
 
     @staticmethod
-    def parse_text(self, lines):
+    def parse_text(self, lines, now):
         pkt = dict()
         payload = lines[0].strip()
         if payload:
-            for parser in PacketFactory.KNOWN_PACKETS:
-                m = parser.IDENTIFIER.search(payload)
-                if m:
-                    pkt = parser.parse_text(self, payload, lines)
-                    return pkt
-            dbg_rtld(1, "info: %s" % payload)
+            m = PacketFactory._DISPATCH_RE.search(payload)
+            if m:
+                parser = PacketFactory._DISPATCH[m.lastgroup]
+                pkt = parser.parse_text(self, payload, lines, now)
+                return pkt
+            if DEBUG_RTLD >= 1:
+                dbg_rtld(1, "info: %s", payload)
         else:
-            dbg_rtld(2, "blank line")
-        lines.pop(0)
+            if DEBUG_RTLD >= 2:
+                dbg_rtld(2, "blank line")
+        lines.popleft()
         return None
 
 
@@ -685,6 +803,20 @@ class RtldavisConfigurationEditor(weewx.drivers.AbstractConfEditor):
 
 """
 
+# unit groups of the database fields reused for the rtldavis statistics
+_RTLD_SCHEMA_UNITS = {
+    'extraTemp1':         'group_percent',
+    'extraTemp2':         'group_percent',
+    'extraTemp3':         'group_percent',
+    'leafTemp2':          'group_percent',
+    'consBatteryVoltage': 'group_frequency',
+    'hail':               'group_frequency',
+    'hailRate':           'group_frequency',
+    'heatingTemp':        'group_frequency',
+    'heatingVoltage':     'group_frequency',
+}
+
+
 class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
 
     NUM_CHAN = 10 # 8 channels, one fake channel (9), one unused channel (0)
@@ -741,7 +873,7 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
 
 
     def __init__(self, engine, config_dict):
-        loginf('driver version is %s' % DRIVER_VERSION)
+        loginf('driver version is %s', DRIVER_VERSION)
         self.setup_units_rtld_schema()
 
         if engine:
@@ -764,17 +896,29 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
         if bucket_type not in [0, 1]:
             raise ValueError("unsupported rain bucket type %s" % bucket_type)
         self.rain_per_tip = 0.254 if bucket_type == 0 else 0.2 # mm
-        loginf('using rain_bucket_type %s' % bucket_type)
+        # rain rate (mm/h) times the time between tips (s), for light rain
+        # and for heavy rain, where that time is given in 1/16 s
+        self._rain_num = 3600.0 * self.rain_per_tip
+        self._rain_num_heavy = self._rain_num * 16.0
+        loginf('using rain_bucket_type %s', bucket_type)
         self.sensor_map = dict(self.DEFAULT_SENSOR_MAP)
         if 'sensor_map' in stn_dict:
             self.sensor_map.update(stn_dict['sensor_map'])
-        loginf('sensor map is: %s' % self.sensor_map)
+        loginf('sensor map is: %s', self.sensor_map)
+        # the database fields by sensor observation, so that a packet only
+        # needs a lookup for the observations that it contains
+        self._inv_sensor_map = dict()
+        for k in self.sensor_map:
+            self._inv_sensor_map.setdefault(self.sensor_map[k], []).append(k)
+        # the database fields of the pct_good values of transmitters 0-3
+        self._pct_good_keys = [self._inv_sensor_map.get('pct_good_%d' % tr, [])
+                               for tr in range(0, 4)]
         self._init_stats()
         self.last_rain_count = None
         self._log_humidity_raw = tobool(stn_dict.get('log_humidity_raw', False))
         self._save_pct_good_per_transmitter = tobool(stn_dict.get('save_pct_good_per_transmitter', False))
         self._sensor_map = stn_dict.get('sensor_map', {})
-        loginf('sensor map is %s' % self._sensor_map)
+        loginf('sensor map is %s', self._sensor_map)
         self.cmd = stn_dict.get('cmd', DEFAULT_CMD)
         self.path = stn_dict.get('path', None)
         self.ld_library_path = stn_dict.get('ld_library_path', None)
@@ -783,7 +927,7 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
         if freq not in ['US', 'NZ', 'EU']:
             raise ValueError("invalid frequency %s" % freq)
         self.frequency = freq
-        loginf('using frequency %s' % self.frequency)
+        loginf('using frequency %s', self.frequency)
         channels = dict()
         channels['iss'] = int(stn_dict.get('iss_channel', 1))
         channels['anemometer'] = int(stn_dict.get('anemometer_channel', 0))
@@ -795,17 +939,39 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
         else:
             channels['wind_channel'] = channels['anemometer']
         self.channels = channels
-        loginf('using iss_channel %s' % channels['iss'])
-        loginf('using anemometer_channel %s' % channels['anemometer'])
-        loginf('using leaf_soil_channel %s' % channels['leaf_soil'])
-        loginf('using temp_hum_1_channel %s' % channels['temp_hum_1'])
-        loginf('using temp_hum_2_channel %s' % channels['temp_hum_2'])
-
-        self.transmitters, self.tr_count = RtldavisDriver.ch_to_xmit(self, 
+        # the channels parse_raw compares every packet with
+        self._iss_channel = channels['iss']
+        self._leaf_soil_channel = channels['leaf_soil']
+        # battery field by channel of the stations that send iss type
+        # messages; when stations share a channel the first one wins
+        self._chan_to_bat = dict()
+        for role, bat in (('temp_hum_2', 'bat_th_2'), ('temp_hum_1', 'bat_th_1'),
+                          ('anemometer', 'bat_anemometer'), ('iss', 'bat_iss')):
+            if channels[role] != 0:
+                self._chan_to_bat[channels[role]] = bat
+        # temperature and humidity fields by channel of the extra temp/hum
+        # stations; other channels use the fields of the iss. The humidity
+        # of an anemometer transmitter kit has no field (None).
+        self._temp_field_by_channel = dict()
+        self._hum_field_by_channel = dict()
+        if channels['anemometer'] != 0:
+            self._hum_field_by_channel[channels['anemometer']] = None
+        for role, temp, hum in (('temp_hum_2', 'temp_2', 'humid_2'),
+                                ('temp_hum_1', 'temp_1', 'humid_1')):
+            if channels[role] != 0:
+                self._temp_field_by_channel[channels[role]] = temp
+                self._hum_field_by_channel[channels[role]] = hum
+        loginf('using iss_channel %s', channels['iss'])
+        loginf('using anemometer_channel %s', channels['anemometer'])
+        loginf('using leaf_soil_channel %s', channels['leaf_soil'])
+        loginf('using temp_hum_1_channel %s', channels['temp_hum_1'])
+        loginf('using temp_hum_2_channel %s', channels['temp_hum_2'])
+
+        self.transmitters, self.tr_count = self.ch_to_xmit(
             channels['iss'], channels['anemometer'], channels['leaf_soil'],
             channels['temp_hum_1'], channels['temp_hum_2'])
-        loginf('using transmitters %d' % self.transmitters)
-        loginf('log_humidity_raw %s' % self._log_humidity_raw)
+        loginf('using transmitters %d', self.transmitters)
+        loginf('log_humidity_raw %s', self._log_humidity_raw)
 
         self.cmd = self.cmd + " -tf " + str(self.frequency) + " -tr " + str(self.transmitters)
 
@@ -818,39 +984,37 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
         if engine:
             self.bind(weewx.NEW_ARCHIVE_RECORD, self.new_archive_record)
 
-    @staticmethod
     def ch_to_xmit(self, iss_channel, anemometer_channel, leaf_soil_channel,
                    temp_hum_1_channel, temp_hum_2_channel):
-        transmitters = 0
-        transmitters += 1 << (iss_channel - 1)
-        if anemometer_channel != 0:
-            transmitters += 1 << (anemometer_channel - 1)
-        if leaf_soil_channel != 0:
-            transmitters += 1 << (leaf_soil_channel - 1)
-        if temp_hum_1_channel != 0:
-            transmitters += 1 << (temp_hum_1_channel - 1)
-        if temp_hum_2_channel != 0:
-            transmitters += 1 << (temp_hum_2_channel - 1)
+        transmitters = 1 << (iss_channel - 1)
+        for channel in (anemometer_channel, leaf_soil_channel,
+                        temp_hum_1_channel, temp_hum_2_channel):
+            if channel != 0:
+                transmitters |= 1 << (channel - 1)
         # program main.go reports the current msg count for the first 4 active transmitters
         # table self.stats['activeTrIds'] contain the transmitter ID's (range 0-7) of
         # the active transmitters.
         # This is used as a pointer to self.stats['loop_times'] in _update_summaries.
-        mask = 1
+        active_tr_ids = self.stats['activeTrIds']
+        active_tr_id_ptrs = self.stats['activeTrIdPtrs']
         trIdCount = 0
-        for i in range(0, 8):
-            if transmitters & mask != 0:
-                self.stats['activeTrIds'][trIdCount] = i
-                self.stats['activeTrIdPtrs'][i] = trIdCount
-                trIdCount = trIdCount + 1
-            mask = mask << 1
+        remaining = transmitters
+        while remaining:
+            # isolate the lowest active transmitter
+            bit = remaining & -remaining
+            i = bit.bit_length() - 1
+            active_tr_ids[trIdCount] = i
+            active_tr_id_ptrs[i] = trIdCount
+            trIdCount += 1
+            remaining ^= bit
         return transmitters, trIdCount
 
     def _data_to_packet(self, data):
         packet = dict()
         # map sensor observations to database field names
-        for k in self.sensor_map:
-            if self.sensor_map[k] in data:
-                packet[k] = data[self.sensor_map[k]]
+        for field in data:
+            for k in self._inv_sensor_map.get(field, ()):
+                packet[k] = data[field]
         # convert the rain count to a rain delta measure
         if 'rain_count' in data:
             if self.last_rain_count is not None:
@@ -859,15 +1023,15 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
                 rain_count = 0
             # handle rain counter wrap around from 127 to 0
             if rain_count < 0:
-                loginf("rain counter wraparound detected rain_count=%s" %
+                loginf("rain counter wraparound detected rain_count=%s",
                        rain_count)
                 rain_count += 128
             self.last_rain_count = data['rain_count']
             packet['rain'] = float(rain_count) * self.rain_per_tip
             if DEBUG_RAIN:
-                logdbg("rain=%s rain_count=%s last_rain_count=%s" %
-                       (packet['rain'], rain_count, self.last_rain_count))
-        packet['dateTime'] = int(time.time() + 0.5)
+                logdbg("rain=%s rain_count=%s last_rain_count=%s",
+                       packet['rain'], rain_count, self.last_rain_count)
+        packet['dateTime'] = (time_ns() + 500000000) // 1000000000
         packet['usUnits'] = weewx.METRICWX
         return packet
 
@@ -879,69 +1043,89 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
             'activeTrIdPtrs': [0] * 8, # pointer to active transmitter
             'curr_ts': 0,              # time stamp of current archive  
             'last_ts': 0,              # time stamp of previous archive
-            'curr_cnt': [0] * 4,       # received messages since startup at current archive
-            'last_cnt': [0] * 4,       # received messages since startup at previous archive
+            'curr_cnt': array('l', [0] * 4),  # received messages since startup at current archive
+            'last_cnt': array('l', [0] * 4),  # received messages since startup at previous archive
             'max_count': [0] * 4,      # max to receive messages per transmitter current archive period
-            'count': [0] * 4,          # received messages per transmitter current archive period 
+            'count': array('l', [0] * 4),     # received messages per transmitter current archive period 
             'missed': [0] * 4,         # missed messages per transmitter current archive period
             'pct_good': [None] * 4,    # percentage of good messages per transmitter
             'pct_good_all': None}      # percentage of good messages for all transmitters
 
     def _reset_stats(self):
-        self.stats['last_ts'] = self.stats['curr_ts']
+        stats = self.stats
+        stats['last_ts'] = stats['curr_ts']
+        last_cnt = stats['last_cnt']
+        curr_cnt = stats['curr_cnt']
+        pct_good = stats['pct_good']
         for i in range(0, 4):
-            self.stats['last_cnt'][i] = self.stats['curr_cnt'][i]
-            self.stats['pct_good'][i] = None
-        self.stats['pct_good_all'] = None
+            last_cnt[i] = curr_cnt[i]
+            pct_good[i] = None
+        stats['pct_good_all'] = None
 
     def _update_stats(self, curr_cnt0, curr_cnt1, curr_cnt2, curr_cnt3):
         # update the statistics
         # save the message counts since startup
-        self.stats['curr_cnt'][0] = int(curr_cnt0)
-        self.stats['curr_cnt'][1] = int(curr_cnt1)
-        self.stats['curr_cnt'][2] = int(curr_cnt2)
-        self.stats['curr_cnt'][3] = int(curr_cnt3)
+        curr_cnt = self.stats['curr_cnt']
+        curr_cnt[0] = int(curr_cnt0)
+        curr_cnt[1] = int(curr_cnt1)
+        curr_cnt[2] = int(curr_cnt2)
+        curr_cnt[3] = int(curr_cnt3)
 
     def _update_summaries(self):
-        self.stats['curr_ts'] = int(time.time())
-        logdbg("ARCHIVE_STATS: last time: last_cnt[0-3]: %12d %8d %8d %8d %8d" % (self.stats['last_ts'], self.stats['last_cnt'][0], self.stats['last_cnt'][1], self.stats['last_cnt'][2], self.stats['last_cnt'][3]))
-        logdbg("ARCHIVE_STATS: curr time: curr_cnt[0-3]: %12d %8d %8d %8d %8d" % (self.stats['curr_ts'], self.stats['curr_cnt'][0], self.stats['curr_cnt'][1], self.stats['curr_cnt'][2], self.stats['curr_cnt'][3]))
+        stats = self.stats
+        curr_cnt = stats['curr_cnt']
+        last_cnt = stats['last_cnt']
+        max_count = stats['max_count']
+        count = stats['count']
+        missed = stats['missed']
+        pct_good = stats['pct_good']
+        loop_times = stats['loop_times']
+        active_tr_ids = stats['activeTrIds']
+        # only format the debug messages when they are logged
+        debug = log.isEnabledFor(logging.DEBUG)
+        stats['curr_ts'] = time_ns() // 1000000000
+        if debug:
+            logdbg("ARCHIVE_STATS: last time: last_cnt[0-3]: %12d %8d %8d %8d %8d", stats['last_ts'], last_cnt[0], last_cnt[1], last_cnt[2], last_cnt[3])
+            logdbg("ARCHIVE_STATS: curr time: curr_cnt[0-3]: %12d %8d %8d %8d %8d", stats['curr_ts'], curr_cnt[0], curr_cnt[1], curr_cnt[2], curr_cnt[3])
         # if not the first time since startup
-        if self.stats['last_ts'] > 0:
+        if stats['last_ts'] > 0:
             total_count = 0
             total_missed = 0
             total_max_count = 0
-            period = self.stats['curr_ts'] - self.stats['last_ts']
+            period = stats['curr_ts'] - stats['last_ts']
             # do for the first 4 active transmitters
             # Note: the stats of the 5th and more active transmitters are not calculated.
-            for i in range(0, 4):
+            for i, (cc, lc, x) in enumerate(zip(curr_cnt, last_cnt, active_tr_ids)):
                 # if this transmitter is active
-                if self.stats['curr_cnt'][i] > 0:
-                    # y is a pointer to the channel number of the active transmitters (9 means: not-active)
+                if cc > 0:
+                    # x is a pointer to the channel number of the active transmitters (9 means: not-active)
                     # the loop_time is different for each transmitter
-                    x = self.stats['activeTrIds'][i]
                     # calculate per transmitter the theoretical maximum number of received message this archive period
-                    self.stats['max_count'][i] = period // self.stats['loop_times'][x]
-                    self.stats['count'][i] = self.stats['curr_cnt'][i] - self.stats['last_cnt'][i]
+                    mc = period // loop_times[x]
+                    c = cc - lc
+                    max_count[i] = mc
+                    count[i] = c
                     # test if not init (counters reset to zero)
-                    if self.stats['count'][i] > 0:
-                        self.stats['missed'][i] = self.stats['max_count'][i] - self.stats['count'][i]
-                        self.stats['pct_good'][i] = 100.0 * self.stats['count'][i] / self.stats['max_count'][i]
+                    if c > 0:
+                        missed[i] = mc - c
+                        pct_good[i] = 100.0 * c / mc
                         # calculate the totals for all active transmitters
-                        total_count = total_count + self.stats['count'][i]
-                        total_missed = total_missed + self.stats['missed'][i]
-                        total_max_count = total_max_count + self.stats['max_count'][i]
+                        total_count += c
+                        total_missed += mc - c
+                        total_max_count += mc
             # if there is a total
-            if total_max_count > 0 and self.stats['pct_good_all'] is not None:
-                self.stats['pct_good_all'] = 100.0 * total_count / total_max_count
-                logdbg("ARCHIVE_STATS: total_max_count=%d total_count=%d total_missed=%d  pctGood=%6.2f" % 
-                    (total_max_count, total_count, total_missed, self.stats['pct_good_all']))
+            if total_max_count > 0 and stats['pct_good_all'] is not None:
+                stats['pct_good_all'] = 100.0 * total_count / total_max_count
+                if debug:
+                    logdbg("ARCHIVE_STATS: total_max_count=%d total_count=%d total_missed=%d  pctGood=%6.2f",
+                        total_max_count, total_count, total_missed, stats['pct_good_all'])
             # log the stats for each active transmitter and no-init-counters
-            for i in range(0, 4):
-                if self.stats['curr_cnt'][i] > 0 and self.stats['count'][i] > 0 and self.stats['pct_good'] is not None:
-                    x = self.stats['activeTrIds'][i]
-                    logdbg("ARCHIVE_STATS: station %d: max_count= %4d count=%4d missed=%4d pct_good=%6.2f" % 
-                        (i+1, self.stats['max_count'][i], self.stats['count'][i], self.stats['missed'][i], self.stats['pct_good'][i]))
+            if debug:
+                for i in range(0, 4):
+                    if curr_cnt[i] > 0 and count[i] > 0 and pct_good is not None:
+                        x = active_tr_ids[i]
+                        logdbg("ARCHIVE_STATS: station %d: max_count= %4d count=%4d missed=%4d pct_good=%6.2f",
+                            i+1, max_count[i], count[i], missed[i], pct_good[i])
 
     def new_archive_record(self, event):
         logdbg("new_archive_record")
@@ -954,18 +1138,16 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
             event.record['rxCheckPercent'] = self.stats['pct_good_all']
             # test if individual pct_good values have to be saved
             if self._save_pct_good_per_transmitter:
-                for tr in range(0, 4):
-                    data = 'pct_good_%s' % tr
-                    for k in self.sensor_map:
-                        # Test if sensor is in the sensor map.
-                        if self.sensor_map[k] in data:
-                            if tr == 0 and self.tr_count > 1:
-                                # When tr_count = 1 we don't store the pct_good of transmitter 1
-                                # because the value is the same as in rxCheckPercent
-                                event.record[k] = self.stats['pct_good'][tr]
-                            if tr > 0 and tr <= self.tr_count:
-                                # save pct_good for active transmitters (max=4)
-                                event.record[k] = self.stats['pct_good'][tr]
+                for tr, keys in enumerate(self._pct_good_keys):
+                    # the fields of the sensor in the sensor map
+                    for k in keys:
+                        if tr == 0 and self.tr_count > 1:
+                            # When tr_count = 1 we don't store the pct_good of transmitter 1
+                            # because the value is the same as in rxCheckPercent
+                            event.record[k] = self.stats['pct_good'][tr]
+                        if tr > 0 and tr <= self.tr_count:
+                            # save pct_good for active transmitters (max=4)
+                            event.record[k] = self.stats['pct_good'][tr]
         self._reset_stats()  # save current stats in last stats
 
     def closePort(self):
@@ -977,39 +1159,54 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
 
     def genLoopPackets(self):
         packet = dict()
-        time_last_received = int(time.time())
+        time_last_received = time_ns() // 1000000000
         # change the presentation of the FrequencyErrors of the transmitters 
         #  each period
         periodShowOneTransm = 2*24*3600  # 2 days
         rel_transm_to_store = int(((time_last_received-(3*3600)) % (periodShowOneTransm * self.tr_count)) / periodShowOneTransm)
         self.transm_to_store = self.stats['activeTrIds'][rel_transm_to_store]
-        dbg_parse(1, "Number of transmitters: %s, store freqError data for transmitter with ID=%s" % (self.tr_count, self.transm_to_store))
-        
-        while self._mgr.running():
+        if DEBUG_PARSE >= 1:
+            dbg_parse(1, "Number of transmitters: %s, store freqError data for transmitter with ID=%s", self.tr_count, self.transm_to_store)
+
+        # bound once, as the loop below runs for every batch of packets
+        running = self._mgr.running
+        get_stderr = self._mgr.get_stderr
+        create = PacketFactory.create
+        update_stats = self._update_stats
+        data_to_packet = self._data_to_packet
+        while running():
             # the stalled timeout must be greater than the init period
             # init period is EU: 16 s, US, AU and NZ: 133 s
-            if int(time.time()) - time_last_received > 150:
+            if time_ns() // 1000000000 - time_last_received > 150:
                 raise weewx.WeeWxIOError("rtldavis process stalled")
             # program main.go writes its data to stderr
-            for lines in self._mgr.get_stderr():
-                for data in PacketFactory.create(self, lines):
+            for lines in get_stderr():
+                # get_stderr waits in select until rtldavis writes, so the
+                # lines of a batch are received at the same time
+                now = time_ns() // 1000000000
+                for data in create(self, lines):
                     if data:
-                        time_last_received = int(time.time())
+                        time_last_received = now
                         if 'curr_cnt0' in data:
-                            self._update_stats(data['curr_cnt0'], data['curr_cnt1'], data['curr_cnt2'], data['curr_cnt3'])
+                            update_stats(data['curr_cnt0'], data['curr_cnt1'], data['curr_cnt2'], data['curr_cnt3'])
+                        # a plain dict compare is the cheapest duplicate test:
+                        # it stops at the first differing size or value,
+                        # while a hash would have to visit every item
                         if data != self._last_pkt:
                             self._last_pkt = data
-                            packet = self._data_to_packet(data)
+                            packet = data_to_packet(data)
                             if packet is not None:
-                                dbg_parse(3, "pkt= %s" % packet)
+                                if DEBUG_PARSE >= 3:
+                                    dbg_parse(3, "pkt= %s", packet)
                                 yield packet
                         else:
                             if packet:
-                                dbg_parse(3, "ignoring duplicate packet %s" % packet)
+                                if DEBUG_PARSE >= 3:
+                                    dbg_parse(3, "ignoring duplicate packet %s", packet)
                     elif lines:
-                        loginf("missed (unparsed): %s" % lines)
+                        loginf("missed (unparsed): %s", lines)
         else:
-            logerr("err: %s" % self._mgr.get_stderr())
+            logerr("err: %s", self._mgr.get_stderr())
             raise weewx.WeeWxIOError("rtldavis process is not running")
 
     def parse_readings(self, pkt):
@@ -1019,32 +1216,345 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
         try:
             data = self.parse_raw(self, pkt)
         except ValueError as e:
-            logerr("parse failed for '%s': %s" % (pkt, e))
+            logerr("parse failed for '%s': %s", pkt, e)
         return data
 
+    def _msg_supercap(self, pkt, data):
+        # supercap voltage (Vue only) max: 0x3FF (1023)
+        # message example:
+        # 20 04 C3 D4 C1 81 89 EE
+        """When the raw values are divided by 300 the maximum
+        voltage of the super capacitor will be about 2.8 V. This
+        is close to its maximum operating voltage of 2.7 V
+        """
+        supercap_volt_raw = _extract_10bit(pkt[3], pkt[4])
+        if supercap_volt_raw != 0x3FF:
+            data['supercap_volt'] = supercap_volt_raw / 300.0
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "supercap_volt_raw=0x%03x value=%s",
+                          supercap_volt_raw, data['supercap_volt'])
+
+    def _msg_type_3(self, pkt, data):
+        # unknown message type
+        # message examples:
+        # TODO
+        # TODO (no sensor)
+        if DEBUG_PARSE >= 1:
+            dbg_parse(1, "unknown message with type=0x03; "
+                      "pkt[3]=0x%02x pkt[4]=0x%02x pkt[5]=0x%02x",
+                      pkt[3], pkt[4], pkt[5])
+
+    def _msg_uv(self, pkt, data):
+        # uv
+        # message examples:
+        # 40 00 00 12 45 00 B5 2A
+        # 41 00 DE FF C3 00 A9 8D (no sensor)
+        uv_raw = _extract_10bit(pkt[3], pkt[4])
+        if uv_raw != 0x3FF:
+            data['uv'] = uv_raw / 50.0
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "uv_raw=%04x value=%s",
+                          uv_raw, data['uv'])
+
+    def _msg_rain_rate(self, pkt, data):
+        # rain rate
+        # message examples:
+        # 50 00 00 FF 75 00 48 5B (no rain)
+        # 50 00 00 FE 75 00 7F 6B (light_rain)
+        # 50 00 00 1B 15 00 3F 80 (heavy_rain)
+        # 51 00 DB FF 73 00 11 41 (no sensor)
+        """ The published rain_rate formulas differ from each
+        other. For both light and heavy rain we like to know a
+        'time between tips' in s. The rain_rate then would be:
+        3600 [s/h] / time_between_tips [s] * 0.2 [mm] = xxx [mm/h]
+        """
+        p4 = pkt[4]
+        time_between_tips_raw = ((p4 & 0x30) << 4) + pkt[3]  # typical: 64-1022
+        if DEBUG_PARSE >= 2:
+            dbg_parse(2, "time_between_tips_raw=%03x (%s)",
+                      time_between_tips_raw, time_between_tips_raw)
+        if data['channel'] == self._iss_channel: # rain sensor is present
+            rain_rate = None
+            if time_between_tips_raw == 0x3FF:
+                # no rain
+                rain_rate = 0
+                if DEBUG_PARSE >= 3:
+                    dbg_parse(3, "no_rain=%s mm/h", rain_rate)
+            elif p4 & 0x40 == 0:
+                # heavy rain. typical value:
+                # 64/16 - 1020/16 = 4 - 63.8 (180.0 - 11.1 mm/h)
+                rain_rate = self._rain_num_heavy / time_between_tips_raw
+                if DEBUG_PARSE >= 2:
+                    dbg_parse(2, "heavy_rain=%s mm/h, time_between_tips=%s s",
+                              rain_rate, time_between_tips_raw / 16.0)
+            else:
+                # light rain. typical value:
+                # 64 - 1022 (11.1 - 0.8 mm/h)
+                rain_rate = self._rain_num / time_between_tips_raw
+                if DEBUG_PARSE >= 2:
+                    dbg_parse(2, "light_rain=%s mm/h, time_between_tips=%s s",
+                              rain_rate, time_between_tips_raw)
+            data['rain_rate'] = rain_rate
+
+    def _msg_solar_radiation(self, pkt, data):
+        # solar radiation
+        # message examples
+        # 61 00 DB 00 43 00 F4 3B
+        # 60 00 00 FF C5 00 79 DA (no sensor)
+        sr_raw = _extract_10bit(pkt[3], pkt[4])
+        if sr_raw < 0x3FE:
+            data['solar_radiation'] = sr_raw * 1.757936
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "solar_radiation_raw=0x%04x value=%s",
+                          sr_raw, data['solar_radiation'])
+
+    def _msg_solar_power(self, pkt, data):
+        # solar cell output / solar power (Vue only)
+        # message example:
+        # 70 01 F5 CE 43 86 58 E2
+        """When the raw values are divided by 300 the voltage comes
+        in the range of 2.8-3.3 V measured by the machine readable
+        format
+        """
+        solar_power_raw = _extract_10bit(pkt[3], pkt[4])
+        if solar_power_raw != 0x3FF:
+            data['solar_power'] = solar_power_raw / 300.0
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "solar_power_raw=0x%03x solar_power=%s",
+                          solar_power_raw, data['solar_power'])
+
+    def _msg_temperature(self, pkt, data):
+        # outside temperature
+        # message examples:
+        # 80 00 00 33 8D 00 25 11 (digital temp)
+
+        # 81 00 00 59 45 00 A3 E6 (analog temp)
+        # 81 00 DB FF C3 00 AB F8 (no sensor)
+        p4 = pkt[4]
+        temp_raw = (pkt[3] << 4) + (p4 >> 4)  # 12-bits temp value
+        if temp_raw != 0xFFC:
+            if p4 & 0x8:
+                # digital temp sensor
+                temp_f = temp_raw / 10.0
+                temp_c = FtoC(temp_f) # C
+                if DEBUG_PARSE >= 2:
+                    dbg_parse(2, "digital temp_raw=0x%03x temp_f=%s temp_c=%s",
+                              temp_raw, temp_f, temp_c)
+            else:
+                # analog sensor (thermistor)
+                temp_raw /= 4  # 10-bits temp value
+                temp_c = calculate_thermistor_temp(temp_raw)
+                if DEBUG_PARSE >= 2:
+                    dbg_parse(2, "thermistor temp_raw=%s temp_c=%s",
+                              temp_raw, temp_c)
+            data[self._temp_field_by_channel.get(data['channel'], 'temperature')] = temp_c
+
+    def _msg_wind_gust(self, pkt, data):
+        # 10-min average wind gust
+        # message examples:
+        # 91 00 DB 00 03 0E 89 85
+        # 90 00 00 00 05 00 31 51 (no sensor)
+        gust_raw = pkt[3]  # mph
+        gust_index_raw = pkt[5] >> 4
+        if not(gust_raw == 0 and gust_index_raw == 0):
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "W10=%s gust_index_raw=%s",
+                          gust_raw, gust_index_raw)
+            # don't store the 10-min gust data because there is no
+            # field for it reserved in the standard wview schema
+
+    def _msg_humidity(self, pkt, data):
+        # outside humidity
+        # message examples:
+        # A0 00 00 C9 3D 00 2A 87 (digital sensor, variant a)
+        # A0 01 3A 80 3B 00 ED 0E (digital sensor, variant b)
+        # A0 01 41 7F 39 00 18 65 (digital sensor, variant c)
+        # A0 00 00 22 85 00 ED E3 (analog sensor)
+        # A1 00 DB 00 03 00 47 C7 (no sensor)
+        p3 = pkt[3]
+        p4 = pkt[4]
+        humidity_raw = ((p4 >> 4) << 8) + p3
+        if humidity_raw != 0:
+            if p4 & 0x08 == 0x8:
+                # digital sensor
+                humidity = humidity_raw / 10.0
+            else:
+                # analog sensor (pkt[4] & 0x0f == 0x5)
+                humidity = humidity_raw * -0.301 + 710.23
+            field = self._hum_field_by_channel.get(data['channel'], 'humidity')
+            if field is not None:
+                data[field] = humidity
+            else:
+                loginf("Warning: humidity sensor of Anemometer Transmitter Kit not in sensor map: %s", humidity)
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "humidity_raw=0x%03x value=%s",
+                          humidity_raw, humidity)
+            # modification by Luc Heijst
+            if self._log_humidity_raw:
+                # we don't know which bits are used by the old humidity sensor
+                # so we log the full 16 bit code.
+                humidity_raw_full = (p4 << 8) + p3
+                if self.last_hum is not None and humidity_raw_full != self.last_hum:
+                    loginf("rtldavis-luc: humidity_raw= %04x", humidity_raw_full)
+                self.last_hum = humidity_raw_full
+            # end modification by Luc
+
+    def _msg_type_c(self, pkt, data):
+        # unknown message
+        # message example:
+        # C1 04 D0 00 01 00 E9 A4
+        # As we have seen after one day of received data
+        # pkt[3] and pkt[5] are always zero;
+        # pckt[4] has values 0-3 (ATK) or 5 (temp/hum)
+        if DEBUG_PARSE >= 3:
+            dbg_parse(3, "unknown pkt[3]=0x%02x pkt[4]=0x%02x pkt[5]=0x%02x",
+                      pkt[3], pkt[4], pkt[5])
+
+    def _msg_rain_count(self, pkt, data):
+        # rain
+        # message examples:
+        # E0 00 00 05 05 00 9F 3D
+        # E1 00 DB 80 03 00 16 8D (no sensor)
+        rain_count_raw = pkt[3]
+        """We have seen rain counters wrap around at 127 and
+        others wrap around at 255.  When we filter the highest
+        bit, both counter types will wrap at 127.
+        """
+        if rain_count_raw != 0x80:
+            rain_count = rain_count_raw & 0x7F  # skip high bit
+            data['rain_count'] = rain_count
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "rain_count_raw=0x%02x value=%s",
+                          rain_count_raw, rain_count)
+
+    # handlers of the iss and extra sensor messages by message type
+    _MSG_HANDLERS = {
+        2: _msg_supercap,
+        3: _msg_type_3,
+        4: _msg_uv,
+        5: _msg_rain_rate,
+        6: _msg_solar_radiation,
+        7: _msg_solar_power,
+        8: _msg_temperature,
+        9: _msg_wind_gust,
+        0xA: _msg_humidity,
+        0xC: _msg_type_c,
+        0xE: _msg_rain_count,
+    }
+
+    # The handlers below get the module constants they use as default
+    # arguments, so that these are read as locals instead of globals.
+    def _subtype_soil_moisture(self, data, sensor_idx, p2, p3, temp_raw, potential_raw,
+                               _default_temp=DEFAULT_SOIL_TEMP,
+                               _therm_lut=_THERMISTOR_LUT,
+                               _temp_keys=_SOIL_TEMP_KEYS,
+                               _moist_keys=_SOIL_MOIST_KEYS,
+                               _lookup=lookup_potential,
+                               _sm_raw=_SM_RAW, _sm_pot=_SM_POT, _sm_slope=_SM_SLOPE):
+        # soil moisture
+        # message examples:
+        # F2 09 1A 55 C0 00 62 E6
+        # F2 29 FF FF C0 C0 F1 EC (no sensor)
+        if (p2 & p3) == 0xFF:
+            # no sensor: both bytes 0xFF
+            return
+        temp_c = _default_temp
+        if p3 != 0xFF:
+            # soil temperature
+            if DEBUG_PARSE >= 3:
+                # calculate it, with its logging
+                temp_c = calculate_thermistor_temp(temp_raw)
+            else:
+                temp_c = _therm_lut[temp_raw]
+                if temp_c is None:
+                    temp_c = calculate_thermistor_temp(temp_raw)
+            data[_temp_keys[sensor_idx]] = temp_c
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "soil_temp_%s=%s 0x%03x",
+                          sensor_idx + 1, temp_c, temp_raw)
+        if p2 != 0xFF:
+            # soil moisture potential
+            # Lookup soil moisture potential in SM_MAP
+            norm_fact = 0.009  # Normalize potential_raw
+            soil_moisture = _lookup(
+                "soil_moisture", norm_fact,
+                potential_raw, temp_c,
+                _sm_raw, _sm_pot, _sm_slope)
+            data[_moist_keys[sensor_idx]] = soil_moisture
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "soil_moisture_%s=%s 0x%03x",
+                          sensor_idx + 1, soil_moisture, potential_raw)
+
+    def _subtype_leaf_wetness(self, data, sensor_idx, p2, p3, temp_raw, potential_raw,
+                              _default_temp=DEFAULT_SOIL_TEMP,
+                              _therm_lut=_THERMISTOR_LUT,
+                              _temp_keys=_LEAF_TEMP_KEYS,
+                              _wet_keys=_LEAF_WET_KEYS,
+                              _wet_lut=_LEAF_WETNESS_LUT,
+                              _lookup=lookup_potential,
+                              _lw_raw=_LW_RAW, _lw_pot=_LW_POT, _lw_slope=_LW_SLOPE):
+        # leaf wetness
+        # message examples:
+        # F2 0A D4 55 80 00 90 06
+        # F2 2A 00 FF 40 C0 4F 05 (no sensor)
+        if (p2 | (p3 ^ 0xFF)) == 0:
+            # no sensor: p2 is 0x00 and p3 is 0xFF
+            return
+        temp_c = _default_temp
+        if p3 != 0xFF:
+            # leaf temperature
+            if DEBUG_PARSE >= 3:
+                # calculate it, with its logging
+                temp_c = calculate_thermistor_temp(temp_raw)
+            else:
+                temp_c = _therm_lut[temp_raw]
+                if temp_c is None:
+                    temp_c = calculate_thermistor_temp(temp_raw)
+            data[_temp_keys[sensor_idx]] = temp_c
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "leaf_temp_%s=%s 0x%03x",
+                          sensor_idx + 1, temp_c, temp_raw)
+        if p2 != 0:
+            # leaf wetness potential
+            if DEBUG_PARSE >= 2:
+                # Lookup leaf wetness potential in LW_MAP, with its logging
+                norm_fact = 0.0  # Do not normalize potential_raw
+                leaf_wetness = _lookup(
+                    "leaf_wetness", norm_fact,
+                    potential_raw, temp_c,
+                    _lw_raw, _lw_pot, _lw_slope)
+            else:
+                leaf_wetness = _wet_lut[potential_raw]
+            data[_wet_keys[sensor_idx]] = leaf_wetness
+            if DEBUG_PARSE >= 2:
+                dbg_parse(2, "leaf_wetness_%s=%s 0x%03x",
+                          sensor_idx + 1, leaf_wetness, potential_raw)
+
+    # handlers of the leaf and soil station messages by data subtype
+    _SUBTYPE_HANDLERS = {
+        1: _subtype_soil_moisture,
+        2: _subtype_leaf_wetness,
+    }
+
     @staticmethod
     def parse_raw(self, pkt):
         data = dict()
-        data['channel'] = (pkt[0] & 0x7) + 1
-        battery_low = (pkt[0] >> 3) & 0x1
-        if data['channel'] == self.channels['iss']or data['channel'] == self.channels['anemometer'] \
-                or data['channel'] == self.channels['temp_hum_1']or data['channel'] == self.channels['temp_hum_2']:
-            if data['channel'] == self.channels['iss']:
-                data['bat_iss'] = battery_low
-            elif data['channel'] == self.channels['anemometer']:
-                data['bat_anemometer'] = battery_low
-            elif data['channel'] == self.channels['temp_hum_1']:
-                data['bat_th_1'] = battery_low
-            else:
-                data['bat_th_2'] = battery_low
+        # the header and sensor bytes of the packet in one call
+        p0, p1, p2, p3, p4, p5 = _PKT_HDR.unpack_from(pkt)
+        channel = (p0 & 0x7) + 1
+        data['channel'] = channel
+        battery_low = (p0 >> 3) & 0x1
+        bat = self._chan_to_bat.get(channel)
+        if bat is not None:
+            data[bat] = battery_low
             # Each data packet of iss or anemometer contains wind info,
             # but it is only valid when received from the channel with
             # the anemometer connected
             # message examples:
             # 51 06 B2 FF 73 00 76 61
             # E0 00 00 4E 05 00 72 61 (no sensor)
-            wind_speed_raw = pkt[1]
-            wind_dir_raw = pkt[2]
+            wind_speed_raw = p1
+            wind_dir_raw = p2
             if not(wind_speed_raw == 0 and wind_dir_raw == 0):
                 """ The elder Vantage Pro and Pro2 stations measured
                 the wind direction with a potentiometer. This type has
@@ -1057,8 +1567,9 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
                 For now we use the traditional 'pro' formula for all
                 wind directions.
                 """
-                dbg_parse(2, "wind_speed_raw=%03x wind_dir_raw=0x%03x" %
-                          (wind_speed_raw, wind_dir_raw))
+                if DEBUG_PARSE >= 2:
+                    dbg_parse(2, "wind_speed_raw=%03x wind_dir_raw=0x%03x",
+                              wind_speed_raw, wind_dir_raw)
 
                 # Vantage Pro and Pro2
                 if wind_dir_raw == 0:
@@ -1078,279 +1589,47 @@ class RtldavisDriver(weewx.drivers.AbstractDevice, weewx.engine.StdService):
                     data['wind_speed_raw'] = wind_speed_raw
                     data['wind_dir'] = wind_dir_pro
                     data['wind_speed'] = wind_speed_ec * MPH_TO_MPS
-                    dbg_parse(2, "WS=%s WD=%s WS_raw=%s WS_ec=%s WD_raw=%s WD_pro=%s WD_vue=%s" %
-                              (data['wind_speed'], data['wind_dir'],
-                               wind_speed_raw, wind_speed_ec,
-                               wind_dir_raw if wind_dir_raw <= 180 else 360 - wind_dir_raw,
-                               wind_dir_pro, wind_dir_vue))
+                    if DEBUG_PARSE >= 2:
+                        dbg_parse(2, "WS=%s WD=%s WS_raw=%s WS_ec=%s WD_raw=%s WD_pro=%s WD_vue=%s",
+                                  data['wind_speed'], data['wind_dir'],
+                                  wind_speed_raw, wind_speed_ec,
+                                  wind_dir_raw if wind_dir_raw <= 180 else 360 - wind_dir_raw,
+                                  wind_dir_pro, wind_dir_vue)
 
             # data from both iss sensors and extra sensors on
             # Anemometer Transport Kit
-            message_type = (pkt[0] >> 4 & 0xF)
-            if message_type == 2:
-                # supercap voltage (Vue only) max: 0x3FF (1023)
-                # message example:
-                # 20 04 C3 D4 C1 81 89 EE
-                """When the raw values are divided by 300 the maximum
-                voltage of the super capacitor will be about 2.8 V. This
-                is close to its maximum operating voltage of 2.7 V
-                """
-                supercap_volt_raw = ((pkt[3] << 2) + (pkt[4] >> 6)) & 0x3FF
-                if supercap_volt_raw != 0x3FF:
-                    data['supercap_volt'] = supercap_volt_raw / 300.0
-                    dbg_parse(2, "supercap_volt_raw=0x%03x value=%s" %
-                              (supercap_volt_raw, data['supercap_volt']))
-            elif message_type == 3:
-                # unknown message type
-                # message examples:
-                # TODO
-                # TODO (no sensor)
-                dbg_parse(1, "unknown message with type=0x03; "
-                          "pkt[3]=0x%02x pkt[4]=0x%02x pkt[5]=0x%02x"
-                          % (pkt[3], pkt[4], pkt[5]))
-            elif message_type == 4:
-                # uv
-                # message examples:
-                # 40 00 00 12 45 00 B5 2A
-                # 41 00 DE FF C3 00 A9 8D (no sensor)
-                uv_raw = ((pkt[3] << 2) + (pkt[4] >> 6)) & 0x3FF
-                if uv_raw != 0x3FF:
-                    data['uv'] = uv_raw / 50.0
-                    dbg_parse(2, "uv_raw=%04x value=%s" %
-                              (uv_raw, data['uv']))
-            elif message_type == 5:
-                # rain rate
-                # message examples:
-                # 50 00 00 FF 75 00 48 5B (no rain)
-                # 50 00 00 FE 75 00 7F 6B (light_rain)
-                # 50 00 00 1B 15 00 3F 80 (heavy_rain)
-                # 51 00 DB FF 73 00 11 41 (no sensor)
-                """ The published rain_rate formulas differ from each
-                other. For both light and heavy rain we like to know a
-                'time between tips' in s. The rain_rate then would be:
-                3600 [s/h] / time_between_tips [s] * 0.2 [mm] = xxx [mm/h]
-                """
-                time_between_tips_raw = ((pkt[4] & 0x30) << 4) + pkt[3]  # typical: 64-1022
-                dbg_parse(2, "time_between_tips_raw=%03x (%s)" %
-                          (time_between_tips_raw, time_between_tips_raw))
-                if data['channel'] == self.channels['iss']: # rain sensor is present
-                    rain_rate = None
-                    if time_between_tips_raw == 0x3FF:
-                        # no rain
-                        rain_rate = 0
-                        dbg_parse(3, "no_rain=%s mm/h" % rain_rate)
-                    elif pkt[4] & 0x40 == 0:
-                        # heavy rain. typical value:
-                        # 64/16 - 1020/16 = 4 - 63.8 (180.0 - 11.1 mm/h)
-                        time_between_tips = time_between_tips_raw / 16.0
-                        rain_rate = 3600.0 / time_between_tips * self.rain_per_tip
-                        dbg_parse(2, "heavy_rain=%s mm/h, time_between_tips=%s s" %
-                                  (rain_rate, time_between_tips))
-                    else:
-                        # light rain. typical value:
-                        # 64 - 1022 (11.1 - 0.8 mm/h)
-                        time_between_tips = time_between_tips_raw
-                        rain_rate = 3600.0 / time_between_tips * self.rain_per_tip
-                        dbg_parse(2, "light_rain=%s mm/h, time_between_tips=%s s" %
-                                  (rain_rate, time_between_tips))
-                    data['rain_rate'] = rain_rate
-            elif message_type == 6:
-                # solar radiation
-                # message examples
-                # 61 00 DB 00 43 00 F4 3B
-                # 60 00 00 FF C5 00 79 DA (no sensor)
-                sr_raw = ((pkt[3] << 2) + (pkt[4] >> 6)) & 0x3FF
-                if sr_raw < 0x3FE:
-                    data['solar_radiation'] = sr_raw * 1.757936
-                    dbg_parse(2, "solar_radiation_raw=0x%04x value=%s"
-                              % (sr_raw, data['solar_radiation']))
-            elif message_type == 7:
-                # solar cell output / solar power (Vue only)
-                # message example:
-                # 70 01 F5 CE 43 86 58 E2
-                """When the raw values are divided by 300 the voltage comes
-                in the range of 2.8-3.3 V measured by the machine readable
-                format
-                """
-                solar_power_raw = ((pkt[3] << 2) + (pkt[4] >> 6)) & 0x3FF
-                if solar_power_raw != 0x3FF:
-                    data['solar_power'] = solar_power_raw / 300.0
-                    dbg_parse(2, "solar_power_raw=0x%03x solar_power=%s"
-                              % (solar_power_raw, data['solar_power']))
-            elif message_type == 8:
-                # outside temperature
-                # message examples:
-                # 80 00 00 33 8D 00 25 11 (digital temp)
-
-                # 81 00 00 59 45 00 A3 E6 (analog temp)
-                # 81 00 DB FF C3 00 AB F8 (no sensor)
-                temp_raw = (pkt[3] << 4) + (pkt[4] >> 4)  # 12-bits temp value
-                if temp_raw != 0xFFC:
-                    if pkt[4] & 0x8:
-                        # digital temp sensor
-                        temp_f = temp_raw / 10.0
-                        temp_c = weewx.wxformulas.FtoC(temp_f) # C
-                        dbg_parse(2, "digital temp_raw=0x%03x temp_f=%s temp_c=%s"
-                                  % (temp_raw, temp_f, temp_c))
-                    else:
-                        # analog sensor (thermistor)
-                        temp_raw /= 4  # 10-bits temp value
-                        temp_c = calculate_thermistor_temp(temp_raw)
-                        dbg_parse(2, "thermistor temp_raw=%s temp_c=%s"
-                                  % (temp_raw, temp_c))
-                    if data['channel'] == self.channels['temp_hum_1']:
-                        data['temp_1'] = temp_c
-                    elif data['channel'] == self.channels['temp_hum_2']:
-                        data['temp_2'] = temp_c
-                    else:
-                        data['temperature'] = temp_c
-            elif message_type == 9:
-                # 10-min average wind gust
-                # message examples:
-                # 91 00 DB 00 03 0E 89 85
-                # 90 00 00 00 05 00 31 51 (no sensor)
-                gust_raw = pkt[3]  # mph
-                gust_index_raw = pkt[5] >> 4
-                if not(gust_raw == 0 and gust_index_raw == 0):
-                    dbg_parse(2, "W10=%s gust_index_raw=%s" %
-                              (gust_raw, gust_index_raw))
-                    # don't store the 10-min gust data because there is no
-                    # field for it reserved in the standard wview schema
-            elif message_type == 0xA:
-                # outside humidity
-                # message examples:
-                # A0 00 00 C9 3D 00 2A 87 (digital sensor, variant a)
-                # A0 01 3A 80 3B 00 ED 0E (digital sensor, variant b)
-                # A0 01 41 7F 39 00 18 65 (digital sensor, variant c)
-                # A0 00 00 22 85 00 ED E3 (analog sensor)
-                # A1 00 DB 00 03 00 47 C7 (no sensor)
-                humidity_raw = ((pkt[4] >> 4) << 8) + pkt[3]
-                if humidity_raw != 0:
-                    if pkt[4] & 0x08 == 0x8:
-                        # digital sensor
-                        humidity = humidity_raw / 10.0
-                    else:
-                        # analog sensor (pkt[4] & 0x0f == 0x5)
-                        humidity = humidity_raw * -0.301 + 710.23
-                    if data['channel'] == self.channels['temp_hum_1']:
-                        data['humid_1'] = humidity
-                    elif data['channel'] == self.channels['temp_hum_2']:
-                        data['humid_2'] = humidity
-                    elif data['channel'] == self.channels['anemometer']:
-                        loginf("Warning: humidity sensor of Anemometer Transmitter Kit not in sensor map: %s" % humidity)
-                    else:
-                        data['humidity'] = humidity
-                    dbg_parse(2, "humidity_raw=0x%03x value=%s" %
-                              (humidity_raw, humidity))
-                    # modification by Luc Heijst
-                    if self._log_humidity_raw:
-                        # we don't know which bits are used by the old humidity sensor
-                        # so we log the full 16 bit code.
-                        humidity_raw_full = (pkt[4] << 8) + pkt[3]
-                        if self.last_hum is not None and humidity_raw_full != self.last_hum:
-                            loginf("rtldavis-luc: humidity_raw= %04x" % humidity_raw_full)
-                        self.last_hum = humidity_raw_full
-                    # end modification by Luc
-            elif message_type == 0xC:
-                # unknown message
-                # message example:
-                # C1 04 D0 00 01 00 E9 A4
-                # As we have seen after one day of received data
-                # pkt[3] and pkt[5] are always zero;
-                # pckt[4] has values 0-3 (ATK) or 5 (temp/hum)
-                dbg_parse(3, "unknown pkt[3]=0x%02x pkt[4]=0x%02x pkt[5]=0x%02x" %
-                          (pkt[3], pkt[4], pkt[5]))
-            elif message_type == 0xE:
-                # rain
-                # message examples:
-                # E0 00 00 05 05 00 9F 3D
-                # E1 00 DB 80 03 00 16 8D (no sensor)
-                rain_count_raw = pkt[3]
-                """We have seen rain counters wrap around at 127 and
-                others wrap around at 255.  When we filter the highest
-                bit, both counter types will wrap at 127.
-                """
-                if rain_count_raw != 0x80:
-                    rain_count = rain_count_raw & 0x7F  # skip high bit
-                    data['rain_count'] = rain_count
-                    dbg_parse(2, "rain_count_raw=0x%02x value=%s" %
-                              (rain_count_raw, rain_count))
+            message_type = p0 >> 4
+            handler = self._MSG_HANDLERS.get(message_type)
+            if handler is not None:
+                handler(self, pkt, data)
             else:
                 # unknown message type
-                logerr("unknown message type 0x%01x" % message_type)
+                logerr("unknown message type 0x%01x", message_type)
 
-        elif data['channel'] == self.channels['leaf_soil']:
+        elif channel == self._leaf_soil_channel:
             # leaf and soil station
             data['bat_leaf_soil'] = battery_low
-            data_type = pkt[0] >> 4
-            if data_type == 0xF:
-                data_subtype = pkt[1] & 0x3
-                sensor_num = ((pkt[1] & 0xe0) >> 5) + 1
-                temp_c = DEFAULT_SOIL_TEMP
-                temp_raw = ((pkt[3] << 2) + (pkt[5] >> 6)) & 0x3FF
-                potential_raw = ((pkt[2] << 2) + (pkt[4] >> 6)) & 0x3FF
-
-                if data_subtype == 1:
-                    # soil moisture
-                    # message examples:
-                    # F2 09 1A 55 C0 00 62 E6
-                    # F2 29 FF FF C0 C0 F1 EC (no sensor)
-                    if pkt[3] != 0xFF:
-                        # soil temperature
-                        temp_c = calculate_thermistor_temp(temp_raw)
-                        data['soil_temp_%s' % sensor_num] = temp_c
-                        dbg_parse(2, "soil_temp_%s=%s 0x%03x" %
-                                  (sensor_num, temp_c, temp_raw))
-                    if pkt[2] != 0xFF:
-                        # soil moisture potential
-                        # Lookup soil moisture potential in SM_MAP
-                        norm_fact = 0.009  # Normalize potential_raw
-                        soil_moisture = lookup_potential(
-                            "soil_moisture", norm_fact,
-                            potential_raw, temp_c, SM_MAP)
-                        data['soil_moisture_%s' % sensor_num] = soil_moisture
-                        dbg_parse(2, "soil_moisture_%s=%s 0x%03x" %
-                                  (sensor_num, soil_moisture, potential_raw))
-                elif data_subtype == 2:
-                    # leaf wetness
-                    # message examples:
-                    # F2 0A D4 55 80 00 90 06
-                    # F2 2A 00 FF 40 C0 4F 05 (no sensor)
-                    if pkt[3] != 0xFF:
-                        # leaf temperature
-                        temp_c = calculate_thermistor_temp(temp_raw)
-                        data['leaf_temp_%s' % sensor_num] = temp_c
-                        dbg_parse(2, "leaf_temp_%s=%s 0x%03x" %
-                                  (sensor_num, temp_c, temp_raw))
-                    if pkt[2] != 0:
-                        # leaf wetness potential
-                        # Lookup leaf wetness potential in LW_MAP
-                        norm_fact = 0.0  # Do not normalize potential_raw
-                        leaf_wetness = lookup_potential(
-                            "leaf_wetness", norm_fact,
-                            potential_raw, temp_c, LW_MAP)
-                        data['leaf_wetness_%s' % sensor_num] = leaf_wetness
-                        dbg_parse(2, "leaf_wetness_%s=%s 0x%03x" %
-                                  (sensor_num, leaf_wetness, potential_raw))
+            # data type 0xF: high nibble of p0 set
+            if p0 >= 0xF0:
+                data_subtype = p1 & 0x3
+                # p1..p5 are single bytes, so the shifts need no masks
+                sensor_idx = p1 >> 5  # sensor number - 1
+                temp_raw = (p3 << 2) | (p5 >> 6)
+                potential_raw = (p2 << 2) | (p4 >> 6)
+                handler = self._SUBTYPE_HANDLERS.get(data_subtype)
+                if handler is not None:
+                    handler(self, data, sensor_idx, p2, p3, temp_raw, potential_raw)
                 else:
-                    logerr("unknown subtype '%s' in '%s'" % (data_subtype, temp_raw))
+                    logerr("unknown subtype '%s' in '%s'", data_subtype, temp_raw)
 
         else:
-            logerr("unknown station with channel: %s, raw message: %s" %
-                   (data['channel'], raw))
+            logerr("unknown station with channel: %s, raw message: %s",
+                   channel, raw)
         return data
 
     @staticmethod
     def setup_units_rtld_schema():
-        obs_group_dict['extraTemp1']        = 'group_percent'
-        obs_group_dict['extraTemp2']        = 'group_percent'
-        obs_group_dict['extraTemp3']        = 'group_percent'
-        obs_group_dict['leafTemp2']         = 'group_percent'
-        obs_group_dict['consBatteryVoltage'] = 'group_frequency'
-        obs_group_dict['hail']              = 'group_frequency'
-        obs_group_dict['hailRate']          = 'group_frequency'
-        obs_group_dict['heatingTemp']       = 'group_frequency'
-        obs_group_dict['heatingVoltage']    = 'group_frequency'
+        obs_group_dict.update(_RTLD_SCHEMA_UNITS)
 
 
 ############################## Conf Editor ############################## 
@@ -1402,14 +1681,19 @@ Actions:
         mgr = ProcManager()
         mgr.startup(options.cmd, path=options.path,
                     ld_library_path=options.ld_library_path)
-        while mgr.running():
-            for lines in mgr.get_stderr():
-                payload = lines[0].strip()
-                if payload:
-                    print(payload)
-                lines.pop(0)
-            for lines in mgr.get_stdout():
-                err = lines[0].strip()
-                if err:
-                    print(err)
-                lines.pop(0)
+        running = mgr.running
+        get_stderr = mgr.get_stderr
+        get_stdout = mgr.get_stdout
+        # the lines of ProcManager keep their newline, so the non-blank ones
+        # are written as they are instead of stripped and printed
+        write = sys.stdout.write
+        # get_stderr waits in select for the output of rtldavis, so this
+        # loop does not spin while the radio is idle
+        while running():
+            for lines in get_stderr():
+                for payload in lines:
+                    if not payload.isspace():
+                        write(payload)
+            for line in get_stdout():
+                if not line.isspace():
+                    write(line)